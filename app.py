@@ -1,12 +1,7 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
-import plotly.express as px
 
-from sklearn.preprocessing import OneHotEncoder
-from sklearn.compose import ColumnTransformer
-from sklearn.pipeline import Pipeline
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from resources import get_df, get_models, get_categories, build_onnx_sessions
 
 # ---------------- PAGE CONFIG ----------------
 st.set_page_config(
@@ -31,112 +26,102 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# ---------------- LOAD DATA ----------------
-
-
-@st.cache_data
-def load_data():
-    return pd.read_csv("data/final_instagram_model_data.csv")
-
-# ---------------- TRAIN MODELS (CLOUD SAFE) ----------------
-
-
-@st.cache_resource
-def train_models(df):
-    X = df.drop(columns=["is_viral", "normalized_engagement"])
-    y_class = df["is_viral"]
-    y_reg = df["normalized_engagement"]
-
-    cat_cols = X.select_dtypes(include="object").columns
-    num_cols = X.select_dtypes(exclude="object").columns
-
-    preprocessor = ColumnTransformer([
-        ("cat", OneHotEncoder(handle_unknown="ignore"), cat_cols),
-        ("num", "passthrough", num_cols)
-    ])
-
-    viral_model = Pipeline([
-        ("prep", preprocessor),
-        ("model", RandomForestClassifier(n_estimators=150, random_state=42))
-    ])
-
-    engagement_model = Pipeline([
-        ("prep", preprocessor),
-        ("model", RandomForestRegressor(n_estimators=150, random_state=42))
-    ])
-
-    viral_model.fit(X, y_class)
-    engagement_model.fit(X, y_reg)
-
-    return viral_model, engagement_model
-
-
-# ---------------- INIT ----------------
-df = load_data()
-viral_model, engagement_model = train_models(df)
-
 # ---------------- HEADER ----------------
+# rendered before the heavy init so the first paint isn't blocked on
+# model loading
 st.markdown("## 📊 Instagram Marketing Intelligence Platform")
 st.markdown("AI-powered dashboard to predict **virality & engagement**")
 
+# ---------------- INIT ----------------
+df = get_df()
+categories = get_categories()
+preprocessor, viral_model, engagement_model = get_models()
+
+feature_df = df.drop(columns=["is_viral", "normalized_engagement"])
+cat_cols = tuple(feature_df.select_dtypes(include="category").columns)
+num_cols = tuple(feature_df.select_dtypes(exclude="category").columns)
+
+viral_sess, engagement_sess = build_onnx_sessions(
+    viral_model, engagement_model, len(cat_cols) + len(num_cols))
+
+# category -> ordinal code, straight from the fitted encoder, so predict
+# can build the feature row without going through pandas at all
+encoder = preprocessor.named_transformers_["cat"]
+cat_codes = {col: {cat: code for code, cat in enumerate(cats)}
+             for col, cats in zip(cat_cols, encoder.categories_)}
+
+# ---------------- PREDICT (MEMOIZED ON INPUTS) ----------------
+
+
+@st.cache_data(max_entries=128)
+def predict(account_type, media_type, content_category, traffic_source,
+            follower_count, hashtags_count, caption_length, has_cta,
+            is_weekend, post_hour, likes, comments, shares, saves):
+    # feature row in ColumnTransformer output order: cat codes, then nums
+    features = np.array([[
+        cat_codes["account_type"][account_type],
+        cat_codes["media_type"][media_type],
+        cat_codes["content_category"][content_category],
+        cat_codes["traffic_source"][traffic_source],
+        follower_count,
+        hashtags_count,
+        caption_length,
+        has_cta,
+        is_weekend,
+        post_hour,
+        likes,
+        comments,
+        shares,
+        saves
+    ]], dtype=np.float32)
+
+    viral_prob = viral_sess.run(None, {"input": features})[1][0, 1]
+    engagement_pred = engagement_sess.run(None, {"input": features})[0][0, 0]
+
+    return float(viral_prob), float(engagement_pred)
+
+
 # ---------------- SIDEBAR ----------------
 st.sidebar.header("🔧 Post Configuration")
 st.sidebar.caption("Set values → click Analyze")
 
-account_type = st.sidebar.selectbox(
-    "Account Type", sorted(df["account_type"].unique()))
-media_type = st.sidebar.selectbox(
-    "Media Type", sorted(df["media_type"].unique()))
-content_category = st.sidebar.selectbox(
-    "Content Category", sorted(df["content_category"].unique()))
-traffic_source = st.sidebar.selectbox(
-    "Traffic Source", sorted(df["traffic_source"].unique()))
-
-follower_count = st.sidebar.number_input(
-    "Follower Count", 100, 1_000_000, 10000)
-
-hashtags_count = st.sidebar.slider("Hashtag Count", 0, 30, 10)
-caption_length = st.sidebar.slider("Caption Length (words)", 0, 300, 50)
-post_hour = st.sidebar.slider("Post Hour", 0, 23, 18)
-
-has_cta = st.sidebar.selectbox("Call To Action", [0, 1])
-is_weekend = st.sidebar.selectbox("Is Weekend", [0, 1])
-
-# ✅ FIXED INPUTS
-likes = st.sidebar.number_input("Expected Likes", 0, 50000, 500)
-comments = st.sidebar.number_input("Expected Comments", 0, 5000, 50)
-shares = st.sidebar.number_input("Expected Shares", 0, 5000, 20)
-saves = st.sidebar.number_input("Expected Saves", 0, 5000, 30)
-
-analyze = st.sidebar.button(
-    "🔍 Analyze Post",
-    disabled=follower_count <= 0
-)
+# the form batches widget edits: no rerun until the submit button
+with st.sidebar.form("post_config"):
+    account_type = st.selectbox("Account Type", categories["account_type"])
+    media_type = st.selectbox("Media Type", categories["media_type"])
+    content_category = st.selectbox(
+        "Content Category", categories["content_category"])
+    traffic_source = st.selectbox(
+        "Traffic Source", categories["traffic_source"])
+
+    follower_count = st.number_input(
+        "Follower Count", 100, 1_000_000, 10000)
+
+    hashtags_count = st.slider("Hashtag Count", 0, 30, 10)
+    caption_length = st.slider("Caption Length (words)", 0, 300, 50)
+    post_hour = st.slider("Post Hour", 0, 23, 18)
+
+    has_cta = st.selectbox("Call To Action", [0, 1])
+    is_weekend = st.selectbox("Is Weekend", [0, 1])
+
+    # ✅ FIXED INPUTS
+    likes = st.number_input("Expected Likes", 0, 50000, 500)
+    comments = st.number_input("Expected Comments", 0, 5000, 50)
+    shares = st.number_input("Expected Shares", 0, 5000, 20)
+    saves = st.number_input("Expected Saves", 0, 5000, 30)
 
-# ---------------- INPUT DF ----------------
-input_df = pd.DataFrame([{
-    "account_type": account_type,
-    "media_type": media_type,
-    "content_category": content_category,
-    "traffic_source": traffic_source,
-    "follower_count": follower_count,
-    "hashtags_count": hashtags_count,
-    "caption_length": caption_length,
-    "has_cta": has_cta,
-    "is_weekend": is_weekend,
-    "post_hour": post_hour,
-    "likes": likes,
-    "comments": comments,
-    "shares": shares,
-    "saves": saves
-}])
-
-viral_prob = None
-engagement_pred = None
+    analyze = st.form_submit_button("🔍 Analyze Post")
 
+# ---------------- PREDICTION ----------------
 if analyze:
-    viral_prob = viral_model.predict_proba(input_df)[0][1]
-    engagement_pred = engagement_model.predict(input_df)[0]
+    st.session_state["last_result"] = predict(
+        account_type, media_type, content_category, traffic_source,
+        follower_count, hashtags_count, caption_length, has_cta,
+        is_weekend, post_hour, likes, comments, shares, saves)
+
+# keep showing the last analysis across reruns that don't resubmit
+viral_prob, engagement_pred = st.session_state.get(
+    "last_result", (None, None))
 
 # ---------------- KPI ----------------
 st.markdown('<div class="section-title">Performance Snapshot</div>',
@@ -172,7 +157,7 @@ with c3:
 st.markdown('<div class="section-title">🧠 AI Insights</div>',
             unsafe_allow_html=True)
 
-if not analyze:
+if viral_prob is None:
     st.info("👈 Adjust inputs and click **Analyze Post**")
 elif viral_prob >= 0.7:
     st.success("🚀 High virality potential")
@@ -182,15 +167,44 @@ else:
     st.error("❌ Low virality — optimize content")
 
 # ---------------- CHART ----------------
+
+
+@st.cache_data
+def build_trend_fig(df):
+    # deferred: plotly costs ~1s at import and only the chart needs it
+    import plotly.graph_objects as go
+
+    # one mean per hour: 24 points to the browser instead of 30k rows
+    trend = (
+        df.groupby("post_hour", as_index=False)["normalized_engagement"]
+        .mean()
+    )
+
+    # Scattergl renders on the GPU instead of the SVG DOM
+    fig = go.Figure(go.Scattergl(
+        x=trend["post_hour"],
+        y=trend["normalized_engagement"],
+        fill="tozeroy",
+        line=dict(color="#ff7a18")
+    ))
+    fig.update_layout(
+        template="plotly_dark",
+        xaxis_title="post_hour",
+        yaxis_title="normalized_engagement",
+        # keep client-side zoom/pan across reruns instead of re-rendering
+        uirevision="constant"
+    )
+
+    return fig
+
+
 st.markdown('<div class="section-title">📊 Engagement Trend</div>',
             unsafe_allow_html=True)
 
-fig = px.area(
-    df.sort_values("post_hour"),
-    x="post_hour",
-    y="normalized_engagement",
-    template="plotly_dark"
-)
+fig = build_trend_fig(df)
 
-st.plotly_chart(fig, use_container_width=True)
+st.plotly_chart(fig, use_container_width=True, config={
+    "displaylogo": False,
+    "modeBarButtonsToRemove": ["lasso2d", "select2d", "autoScale2d"]
+})
 st.caption("Portfolio project — Instagram Marketing Intelligence")
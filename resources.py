@@ -0,0 +1,150 @@
+"""Shared cached data and model factories.
+
+Streamlit's caches are process-wide, so every page that imports from
+here shares a single DataFrame, one pair of fitted models and one pair
+of ONNX inference sessions — nothing gets loaded or fitted twice even
+with multiple pages or concurrent sessions.
+"""
+
+from pathlib import Path
+
+import streamlit as st
+import pandas as pd
+import joblib
+
+# sklearn and the ONNX stack are imported lazily inside the factories:
+# they cost over a second at interpreter startup and the cached results
+# mean each import runs at most once per process anyway
+
+# compact dtypes: the float64/int64 defaults double the cached frame's
+# footprint for no benefit at these value ranges
+CSV_DTYPES = {
+    "account_type": "category",
+    "media_type": "category",
+    "content_category": "category",
+    "traffic_source": "category",
+    "follower_count": "int32",
+    "hashtags_count": "int8",
+    "caption_length": "int16",
+    "post_hour": "int8",
+    "has_cta": "int8",
+    "is_weekend": "int8",
+    "likes": "int32",
+    "comments": "int32",
+    "shares": "int32",
+    "saves": "int32",
+    "normalized_engagement": "float32",
+    "is_viral": "int8"
+}
+
+
+@st.cache_data(persist="disk", show_spinner=False)
+def get_df():
+    return pd.read_csv("data/final_instagram_model_data.csv",
+                       dtype=CSV_DTYPES, engine="pyarrow")
+
+
+@st.cache_data
+def get_categories():
+    df = get_df()
+    cat_cols = df.select_dtypes(include="category").columns
+
+    return {col: tuple(sorted(df[col].unique())) for col in cat_cols}
+
+
+@st.cache_resource
+def train_models(df):
+    from sklearn.preprocessing import OrdinalEncoder
+    from sklearn.compose import ColumnTransformer
+    from sklearn.ensemble import (RandomForestClassifier,
+                                  RandomForestRegressor)
+
+    X = df.drop(columns=["is_viral", "normalized_engagement"])
+    y_class = df["is_viral"]
+    y_reg = df["normalized_engagement"]
+
+    cat_cols = X.select_dtypes(include="category").columns
+    num_cols = X.select_dtypes(exclude="category").columns
+
+    # one shared preprocessor, fitted once; the estimators train on the
+    # transformed matrix so inference only pays for the transform once
+    preprocessor = ColumnTransformer([
+        ("cat", OrdinalEncoder(handle_unknown="use_encoded_value",
+                               unknown_value=-1), cat_cols),
+        ("num", "passthrough", num_cols)
+    ])
+
+    Xt = preprocessor.fit_transform(X)
+
+    viral_model = RandomForestClassifier(n_estimators=50, max_depth=12,
+                                         min_samples_leaf=5, n_jobs=-1,
+                                         random_state=42)
+
+    engagement_model = RandomForestRegressor(n_estimators=50, max_depth=12,
+                                             min_samples_leaf=5, n_jobs=-1,
+                                             random_state=42)
+
+    viral_model.fit(Xt, y_class)
+    engagement_model.fit(Xt, y_reg)
+
+    # fit across all cores, but predict single-threaded: for one-row
+    # scoring the joblib fork costs more than the tree walks
+    viral_model.n_jobs = 1
+    engagement_model.n_jobs = 1
+
+    return preprocessor, viral_model, engagement_model
+
+
+@st.cache_resource
+def get_models():
+    csv_path = Path("data/final_instagram_model_data.csv")
+    paths = [Path("models/preprocessor.pkl"),
+             Path("models/viral.pkl"),
+             Path("models/engagement.pkl")]
+
+    # only trust artifacts that postdate the training data
+    csv_mtime = csv_path.stat().st_mtime
+    if all(path.exists() and path.stat().st_mtime > csv_mtime
+           for path in paths):
+        return tuple(joblib.load(path) for path in paths)
+
+    # missing or stale artifacts — retrain and persist for the next boot
+    models = train_models(get_df())
+    paths[0].parent.mkdir(exist_ok=True)
+    for obj, path in zip(models, paths):
+        joblib.dump(obj, path, compress=3)
+
+    return models
+
+
+@st.cache_resource
+def build_onnx_sessions(_viral_model, _engagement_model, n_features):
+    import onnxruntime as ort
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+
+    initial_types = [("input", FloatTensorType([None, n_features]))]
+
+    # zipmap=False returns probabilities as a plain array instead of dicts
+    viral_onnx = convert_sklearn(
+        _viral_model,
+        initial_types=initial_types,
+        options={"zipmap": False}
+    ).SerializeToString()
+
+    engagement_onnx = convert_sklearn(
+        _engagement_model,
+        initial_types=initial_types
+    ).SerializeToString()
+
+    # single-row scoring: one thread, full graph optimization
+    sess_options = ort.SessionOptions()
+    sess_options.graph_optimization_level = \
+        ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    sess_options.intra_op_num_threads = 1
+
+    viral_sess = ort.InferenceSession(viral_onnx, sess_options=sess_options)
+    engagement_sess = ort.InferenceSession(
+        engagement_onnx, sess_options=sess_options)
+
+    return viral_sess, engagement_sess
@@ -0,0 +1,94 @@
+"""Fit the virality and engagement models once and persist them to models/.
+
+The app loads these artifacts on startup instead of re-fitting two
+150-tree forests on every cold container start. Re-run after changing
+data/final_instagram_model_data.csv:
+
+    python scripts/train.py
+"""
+
+from pathlib import Path
+
+import joblib
+import pandas as pd
+
+from sklearn.preprocessing import OrdinalEncoder
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+
+DATA_PATH = Path("data/final_instagram_model_data.csv")
+MODEL_DIR = Path("models")
+
+# keep in sync with CSV_DTYPES in resources.py so the shipped artifacts
+# match what the in-app fallback trainer would produce
+CSV_DTYPES = {
+    "account_type": "category",
+    "media_type": "category",
+    "content_category": "category",
+    "traffic_source": "category",
+    "follower_count": "int32",
+    "hashtags_count": "int8",
+    "caption_length": "int16",
+    "post_hour": "int8",
+    "has_cta": "int8",
+    "is_weekend": "int8",
+    "likes": "int32",
+    "comments": "int32",
+    "shares": "int32",
+    "saves": "int32",
+    "normalized_engagement": "float32",
+    "is_viral": "int8"
+}
+
+
+def train(df):
+    X = df.drop(columns=["is_viral", "normalized_engagement"])
+    y_class = df["is_viral"]
+    y_reg = df["normalized_engagement"]
+
+    cat_cols = X.select_dtypes(include="category").columns
+    num_cols = X.select_dtypes(exclude="category").columns
+
+    # one shared preprocessor, fitted once — mirrors resources.train_models
+    preprocessor = ColumnTransformer([
+        ("cat", OrdinalEncoder(handle_unknown="use_encoded_value",
+                               unknown_value=-1), cat_cols),
+        ("num", "passthrough", num_cols)
+    ])
+
+    Xt = preprocessor.fit_transform(X)
+
+    viral_model = RandomForestClassifier(n_estimators=50, max_depth=12,
+                                         min_samples_leaf=5, n_jobs=-1,
+                                         oob_score=True,
+                                         random_state=42)
+
+    engagement_model = RandomForestRegressor(n_estimators=50, max_depth=12,
+                                             min_samples_leaf=5, n_jobs=-1,
+                                             oob_score=True,
+                                             random_state=42)
+
+    viral_model.fit(Xt, y_class)
+    engagement_model.fit(Xt, y_reg)
+
+    # fit across all cores, but predict single-threaded: for one-row
+    # scoring the joblib fork costs more than the tree walks
+    viral_model.n_jobs = 1
+    engagement_model.n_jobs = 1
+
+    # sanity check that the capped forests haven't lost accuracy
+    print(f"viral OOB accuracy: {viral_model.oob_score_:.4f}")
+    print(f"engagement OOB R^2: {engagement_model.oob_score_:.4f}")
+
+    return preprocessor, viral_model, engagement_model
+
+
+if __name__ == "__main__":
+    df = pd.read_csv(DATA_PATH, dtype=CSV_DTYPES)
+    preprocessor, viral_model, engagement_model = train(df)
+
+    MODEL_DIR.mkdir(exist_ok=True)
+    joblib.dump(preprocessor, MODEL_DIR / "preprocessor.pkl", compress=3)
+    joblib.dump(viral_model, MODEL_DIR / "viral.pkl", compress=3)
+    joblib.dump(engagement_model, MODEL_DIR / "engagement.pkl", compress=3)
+    print(f"Saved models to {MODEL_DIR}/")